@@ -832,8 +832,8 @@ class TasksAnalysis(TraceAnalysisBase):
             df = df[df.target_cpu.isin(target_cpus)]
 
         series = series_rolling_apply(df["target_cpu"],
-                                      lambda x: x.count() / (window if per_sec else 1),
-                                      window, window_float_index=False, center=True)
+                                      lambda x: np.count_nonzero(~np.isnan(x)) / (window if per_sec else 1),
+                                      window, window_float_index=False, center=True, raw=True)
 
         series = series_refit_index(series, window=self.trace.window)
         series.plot(ax=axis, legend=False)
@@ -894,8 +894,8 @@ class TasksAnalysis(TraceAnalysisBase):
             df = df[df.target_cpu.isin(target_cpus)]
 
         series = series_rolling_apply(df["target_cpu"],
-                                      lambda x: x.count() / (window if per_sec else 1),
-                                      window, window_float_index=False, center=True)
+                                      lambda x: np.count_nonzero(~np.isnan(x)) / (window if per_sec else 1),
+                                      window, window_float_index=False, center=True, raw=True)
 
         series = series_refit_index(series, window=self.trace.window)
         series.plot(ax=axis, legend=False)
@@ -17,7 +17,6 @@
 
 import re
 import functools
-import operator
 import math
 import itertools
 import warnings
@@ -192,6 +191,53 @@ def df_split_signals(df, signal_cols, align_start=False, window=None):
             yield (cols_val, signal)
 
 
+def _df_group_signals(df, signal_cols):
+    """
+    Group the rows of ``df`` by the values of ``signal_cols``.
+
+    This is equivalent to ``df.groupby(signal_cols, observed=True,
+    sort=False)``, but avoids the overhead of the generic groupby machinery.
+
+    :returns: A tuple ``(ilocs, starts, ends)``. ``ilocs`` is an array of
+        positional indices in ``df``, such that ``ilocs[starts[i]:ends[i]]``
+        are the rows of the i-th group, in their original order. Groups are
+        ordered by first appearance in ``df``.
+    """
+    codes_list = [
+        pd.factorize(df[col], sort=False)
+        for col in signal_cols
+    ]
+
+    # Rows with a missing value in any of the columns are not part of any
+    # group, as with DataFrame.groupby()
+    valid = np.logical_and.reduce([codes >= 0 for codes, uniques in codes_list])
+    valid_ilocs = np.flatnonzero(valid)
+
+    group_codes, group_uniques = codes_list[0]
+    group_codes = group_codes[valid_ilocs]
+    for codes, uniques in codes_list[1:]:
+        # Combine the codes of each column into one code per row, and
+        # re-factorize it so it stays bounded by the number of rows. This
+        # also gives codes ordered by first appearance of the combination.
+        group_codes = group_codes * len(uniques) + codes[valid_ilocs]
+        group_codes, group_uniques = pd.factorize(group_codes, sort=False)
+
+    # Stable sort so that rows inside each group keep their original order.
+    # Using the narrowest dtype for the codes allows numpy to use a radix sort
+    # for up to 65536 groups, which is much faster than the comparison-based
+    # sort it uses for wider integers.
+    group_codes = group_codes.astype(
+        np.min_scalar_type(max(len(group_uniques) - 1, 0)),
+        copy=False,
+    )
+    order = np.argsort(group_codes, kind='stable')
+    counts = np.bincount(group_codes)
+    ends = np.cumsum(counts)
+    starts = ends - counts
+
+    return (valid_ilocs[order], starts, ends)
+
+
 def _data_refit_index(data, window, method, clip_window):
     if data.empty:
         raise ValueError('Cannot refit the index of an empty dataframe or series')
@@ -203,6 +249,16 @@ def _data_refit_index(data, window, method, clip_window):
     if data.empty:
         return data
 
+    # Nothing to change if the index already fits the window.
+    # _data_window() already returned a new object, so there is no need to
+    # copy it again.
+    if (
+        not duplicate_last and
+        (start is None or data.index[0] >= start) and
+        (end is None or data.index[-1] == end)
+    ):
+        return data
+
     # When the end is after the end of the data, duplicate the last row so we
     # can push it to the right as much as we want without changing the point at
     # which the transition to that value happened
@@ -213,18 +269,29 @@ def _data_refit_index(data, window, method, clip_window):
         # actual data
         data = data.copy(deep=False)
 
-    index = data.index.to_series()
+    # Work on a plain array rather than going through pandas indexing for
+    # each value
+    index = data.index.values.copy()
+    updates = {}
 
     # Only advance the beginning of the data, never move it in the past.
     # Otherwise, we "invent" a value for the signal that did not existed,
     # leading to various wrong results.
-    if start is not None and index.iloc[0] < start:
-        index.iloc[0] = start
+    if start is not None and index[0] < start:
+        updates[0] = start
 
     if end is not None:
-        index.iloc[-1] = end
+        updates[-1] = end
+
+    # Only upcast the index if the new values cannot be represented exactly
+    for x in updates.values():
+        if np.array(x).astype(index.dtype) != x:
+            index = index.astype(np.result_type(index, x))
+
+    for i, x in updates.items():
+        index[i] = x
 
-    data.index = index
+    data.index = pd.Index(index, name=data.index.name, copy=False)
     return data
 
 
@@ -302,22 +369,39 @@ def df_squash(df, start, end, column='delta'):
     # If s1 is in the interval, we just need to cap its len to
     # s1 - e1.index
 
-    prev_df = df[:start]
-    middle_df = df[start:end]
+    # When the window spans the whole dataframe, there is no event to tweak
+    # at the beginning, so we can avoid slicing it
+    if start <= df.index[0] and end > df.index[-1]:
+        middle_df = df
+        res_df = df.copy()
+    else:
+        prev_df = df[:start]
+        middle_df = df[start:end]
+        parts = []
+
+        # Tweak the closest previous event to include it in the slice
+        if not prev_df.empty and not (start in middle_df.index):
+            first_df = prev_df.iloc[[-1]].copy()
+            first_df.index = [start]
+            e1 = end
+
+            if not middle_df.empty:
+                e1 = middle_df.index[0]
 
-    # Tweak the closest previous event to include it in the slice
-    if not prev_df.empty and not (start in middle_df.index):
-        res_df = res_df.append(prev_df.tail(1))
-        res_df.index = [start]
-        e1 = end
+            first_df[column] = min(e1 - start, end - start)
+            parts.append(first_df)
 
         if not middle_df.empty:
-            e1 = middle_df.index[0]
+            parts.append(middle_df)
 
-        res_df[column] = min(e1 - start, end - start)
+        if not parts:
+            return res_df
+
+        # Concatenate once rather than appending, which copies the whole
+        # dataframe every time.
+        res_df = pd.concat(parts)
 
     if not middle_df.empty:
-        res_df = res_df.append(middle_df)
         if end in res_df.index:
             # e_last and s1 collide, ditch e_last
             res_df = res_df.drop([end])
@@ -341,15 +425,30 @@ def df_filter(df, filter_columns):
         to be selected.
     :type filter_columns: dict(str, object)
     """
-    key = functools.reduce(
-        operator.and_,
-        (
-            df[col] == val
-            for col, val in filter_columns.items()
-        )
-    )
+    mask = np.ones(len(df), dtype=bool)
+    for col, val in filter_columns.items():
+        values = df[col].values
+        mask &= _to_bool_array(values == val)
+        # Missing values never match anything (including None), like when
+        # comparing pandas.Series
+        if values.dtype == object:
+            mask &= pd.notna(values)
+
+    return df[mask]
+
 
-    return df[key]
+def _to_bool_array(array):
+    """
+    Convert the result of a comparison to a :class:`numpy.ndarray` of
+    ``bool``.
+
+    Missing values in nullable boolean arrays (e.g. from comparing a column
+    with ``string`` dtype) are treated as ``False``, like pandas does when
+    indexing.
+    """
+    if isinstance(array, pd.api.extensions.ExtensionArray):
+        array = array.fillna(False)
+    return np.asarray(array, dtype=bool)
 
 
 def df_merge(df_list, drop_columns=None, drop_inplace=False, filter_columns=None):
@@ -399,7 +498,28 @@ def df_merge(df_list, drop_columns=None, drop_inplace=False, filter_columns=None
     def merge(df1, df2):
         return pd.merge(df1, df2, left_index=True, right_index=True, how='outer')
 
-    return functools.reduce(merge, df_list)
+    # When more than 2 dataframes share the same index, a single
+    # concatenation is cheaper than a chain of pairwise outer merges. It is
+    # only equivalent if the index has no duplicates and no column name is
+    # shared (merge() would add suffixes). With different indices, the
+    # pairwise merges of sorted indices are faster than aligning them all at
+    # once.
+    columns = list(itertools.chain.from_iterable(
+        df.columns
+        for df in df_list
+    ))
+    index = df_list[0].index
+    if (
+        len(df_list) > 2 and
+        len(set(columns)) == len(columns) and
+        # Checking for a monotonic index first makes is_unique cheap
+        index.is_monotonic_increasing and
+        index.is_unique and
+        all(df.index.equals(index) for df in df_list[1:])
+    ):
+        return pd.concat(df_list, axis=1, sort=False, copy=False)
+    else:
+        return functools.reduce(merge, df_list)
 
 
 def _resolve_x(y, x):
@@ -413,6 +533,14 @@ def _resolve_x(y, x):
     return x
 
 
+def _float_values(data):
+    """
+    Get the values of a :class:`pandas.Series` or :class:`pandas.Index` as a
+    :class:`numpy.ndarray` of floats, with missing values turned into NaN.
+    """
+    return data.astype(np.float64, copy=False).values
+
+
 @SeriesAccessor.register_accessor
 def series_derivate(y, x=None, order=1):
     """
@@ -432,12 +560,23 @@ def series_derivate(y, x=None, order=1):
     :param order: Order of the derivative (1 is speed, 2 is acceleration etc).
     :type order: int
     """
-    x = _resolve_x(y, x)
+    x = _float_values(y.index if x is None else x)
+    values = _float_values(y)
 
-    for i in range(order):
-        y = y.diff() / x.diff()
+    def diff(values):
+        # Same as pandas.Series.diff()
+        res = np.empty_like(values)
+        res[:1] = np.nan
+        np.subtract(values[1:], values[:-1], out=res[1:])
+        return res
 
-    return y
+    dx = diff(x)
+    # Division by 0 is expected to give inf, like with pandas.Series
+    with np.errstate(divide='ignore', invalid='ignore'):
+        for i in range(order):
+            values = diff(values) / dx
+
+    return pd.Series(values, index=y.index, name=y.name)
 
 
 @SeriesAccessor.register_accessor
@@ -522,21 +661,39 @@ def series_integrate(y, x=None, sign=None, method='rect', rect_step='post'):
     x = _resolve_x(y, x)
 
     if sign == "+":
-        y = y.clip(lower=0)
+        clip = dict(lower=0)
     elif sign == "-":
-        y = y.clip(upper=0)
+        clip = dict(upper=0)
     elif sign is None:
-        pass
+        clip = None
     else:
         raise ValueError('Unsupported "sign": {}'.format(sign))
 
     if method == "rect":
-        dx = x.diff()
+        x = _float_values(x)
+        y = _float_values(y)
+        dx = np.diff(x)
 
         if rect_step == "post":
-            dx = dx.shift(-1)
+            y = y[:-1]
+        else:
+            y = y[1:]
 
-        return (y * dx).sum()
+        # Ignore NaN, like pandas.Series.sum()
+        nan = np.isnan(y) | np.isnan(dx)
+        if nan.any():
+            y = y[~nan]
+            dx = dx[~nan]
+
+        # Clip only the values actually used, without going through an
+        # intermediate Series
+        if clip:
+            y = np.clip(y, clip.get('lower'), clip.get('upper'))
+
+        return np.dot(y, dx)
+
+    if clip:
+        y = y.clip(**clip)
 
     # Make a DataFrame to make sure all rows stay aligned when we drop NaN,
     # which is needed by all the below methods
@@ -682,6 +839,15 @@ def _data_window(data, window, method, clip_window):
     else:
         raise ValueError('Slicing method not supported: {}'.format(method))
 
+    # Fast path when the window spans the whole data. If the last index value
+    # is duplicated, only the first occurrence would be selected.
+    if (
+        clip_window and
+        window == (index[0], index[-1]) and
+        (len(index) < 2 or index[-2] != index[-1])
+    ):
+        return data.copy(deep=False)
+
     window = [
         _get_loc(index, x, method=method) if x is not None else None
         for x, method in zip(window, method)
@@ -694,40 +860,48 @@ def _data_window(data, window, method, clip_window):
 def _get_loc(index, x, method):
     """
     Emulate :func:`pandas.Index.get_loc` behavior with the much faster
-    :func:`pandas.Index.searchsorted`.
+    :func:`pandas.Index.searchsorted`, for the ``ffill``, ``bfill`` and
+    ``nearest`` methods.
 
     .. warning:: Passing a non-sorted index will destroy performance.
     """
 
-    # Not a lot of use for nearest, so fall back on the slow but easy to use get_loc()
-    #
-    # Also, if the index is not sorted, we need to fall back on the slow path
-    # as well. Checking is_monotonic is cheap so it's ok to do it here.
-    if method == 'nearest' or not index.is_monotonic:
+    # If the index is not sorted, we need to fall back on the slow path.
+    # Checking is_monotonic is cheap so it's ok to do it here.
+    if not index.is_monotonic:
         return index.get_loc(x, method=method)
-    else:
-        if index.empty:
-            raise KeyError(x)
+    elif index.empty:
+        raise KeyError(x)
+
+    # Leftmost location where x could be inserted, i.e. the location of x if
+    # it is in the index, or the location of the first value greater than x
+    loc = index.searchsorted(x, side='left')
+    found = loc < len(index) and index[loc] == x
+
+    if found:
+        return loc
+    elif method == 'ffill':
         # get_loc() also raises an exception in these case
-        elif method == 'ffill' and x < index[0]:
+        if loc == 0:
             raise KeyError(x)
-        elif method == 'bfill' and x > index[-1]:
+        return loc - 1
+    elif method == 'bfill':
+        if loc == len(index):
             raise KeyError(x)
-
-        loc = index.searchsorted(x)
-        try:
-            val_at_loc = index[loc]
-        # We are getting an index past the end. This is fine since we already
-        # checked correct bounds before
-        except IndexError:
-            return loc - 1
-
-        if val_at_loc == x:
+        return loc
+    elif method == 'nearest':
+        if loc == 0:
             return loc
-        elif val_at_loc < x:
-            return loc if method == 'ffill' else loc + 1
+        elif loc == len(index):
+            return loc - 1
+        # Like get_loc(), pick the value after x unless the value before is
+        # strictly closer
+        elif x - index[loc - 1] < index[loc] - x:
+            return loc - 1
         else:
-            return loc - 1 if method == 'ffill' else loc
+            return loc
+    else:
+        return index.get_loc(x, method=method)
 
 
 @DataFrameAccessor.register_accessor
@@ -809,33 +983,61 @@ def df_window_signals(df, window, signals, compress_init=False, clip_window=True
         if windowed_df.index[0] == _window[0]:
             windowed_df = windowed_df.iloc[1:]
 
-    def window_signal(signal_df):
-        # Get the row immediately preceding the window start
-        loc = _get_loc(signal_df.index, window[0], method='ffill')
-        return signal_df.iloc[loc:loc + 1]
-
-    # Get the value of each signal at the beginning of the window
-    signal_df_list = [
-        window_signal(signal_df)
-        for signal, signal_df in itertools.chain.from_iterable(
-            df_split_signals(df, signal.fields, align_start=False)
-            for signal in signals
-        )
-        # Only consider the signal that are in the window. Signals that started
-        # after the window are irrelevant.
-        if not signal_df.empty and signal_df.index[0] <= window[0]
-    ]
+    index = df.index.values
+
+    def signal_init_locs(signal):
+        if signal.fields:
+            ilocs, starts, ends = _df_group_signals(df, signal.fields)
+        elif df.empty:
+            return
+        else:
+            ilocs = np.arange(len(df))
+            starts = [0]
+            ends = [len(df)]
+
+        signals_index = index[ilocs]
+        for start, end in zip(starts, ends):
+            signal_index = signals_index[start:end]
+            # Only consider the signal that are in the window. Signals that
+            # started after the window are irrelevant.
+            if signal_index[0] <= window[0]:
+                # Get the row immediately preceding the window start
+                loc = np.searchsorted(signal_index, window[0], side='left')
+                if loc == len(signal_index) or signal_index[loc] != window[0]:
+                    loc -= 1
+                yield ilocs[start + loc]
+
+    # Get the value of each signal at the beginning of the window, with a
+    # single selection in df rather than one per signal
+    init_locs = list(itertools.chain.from_iterable(
+        signal_init_locs(signal)
+        for signal in signals
+    ))
+    signal_df_list = [df.iloc[init_locs]] if init_locs else []
 
     if compress_init:
         def make_init_df_index(init_df):
-            # Yield a sequence of numbers incrementing by the smallest amount
-            # possible
+            # Return a sorted sequence of the closest numbers before "start"
             def smallest_increment(start, length):
-                curr = start
-                for _ in range(length):
-                    curr = before(curr)
-                    yield curr
-
+                # Floats are evenly spaced between two consecutive powers of
+                # 2, so the sequence can be computed in one go. If a power of 2
+                # was crossed, we fall back on stepping one float at a time.
+                start = np.float64(start)
+                step = start - before(start)
+                index = start - step * np.arange(length, 0, -1)
+
+                if np.array_equal(
+                    np.nextafter(index, math.inf),
+                    np.append(index[1:], start),
+                ):
+                    return index
+                else:
+                    index = []
+                    curr = start
+                    for _ in range(length):
+                        curr = before(curr)
+                        index.append(curr)
+                    return np.array(index[::-1])
 
             # If windowed_df is empty, we take the last bit right before the
             # beginning of the window
@@ -844,9 +1046,8 @@ def df_window_signals(df, window, signals, compress_init=False, clip_window=True
             except IndexError:
                 start = extra_df.index[-1]
 
-            index = list(smallest_increment(start, len(init_df)))
-            index = pd.Float64Index(reversed(index))
-            return index
+            index = smallest_increment(start, len(init_df))
+            return pd.Float64Index(index)
     else:
         def make_init_df_index(init_df):
             return init_df.index
@@ -892,16 +1093,28 @@ def series_align_signal(ref, to_align, max_shift=None):
     # Resample so that we operate on a fixed sampled rate signal, which is
     # necessary in order to be able to do a meaningful interpretation of
     # correlation argmax
-    def get_period(series): return pd.Series(series.index).diff().min()
+    def get_period(series):
+        return np.diff(series.index.to_numpy()).min()
+
     period = min(get_period(ref), get_period(to_align))
     num = math.ceil((end - start) / period)
-    new_index = pd.Float64Index(np.linspace(start, end, num))
+    # np.linspace() already gives float64 values
+    new_index = pd.Index(np.linspace(start, end, num), copy=False)
 
     to_align = to_align.reindex(new_index, method='ffill')
     ref = ref.reindex(new_index, method='ffill')
 
-    # Compute the correlation between the two signals
-    correlation = scipy.signal.signaltools.correlate(to_align, ref)
+    # Compute the correlation between the two signals. Force the FFT method,
+    # which is O(N log N), as "auto" can select the O(N^2) direct method on
+    # signals of moderate size.
+    correlation = scipy.signal.correlate(to_align.to_numpy(), ref.to_numpy(), method='fft')
+    # The FFT adds some rounding noise, which would break ties between equal
+    # maxima in an arbitrary way. Round the values relatively to their
+    # magnitude, so that argmax() picks the first of them like with the direct
+    # method.
+    scale = np.abs(correlation).max(initial=0)
+    if scale:
+        correlation = np.round(correlation / scale, 9)
     # The most likely shift is the index at which the correlation is
     # maximum. correlation.argmax() can vary from 0 to 2*len(to_align), so we
     # re-center it.
@@ -929,7 +1142,8 @@ def df_filter_task_ids(df, task_ids, pid_col='pid', comm_col='comm', invert=Fals
     """
     Filter a dataframe using a list of :class:`lisa.trace.TaskID`
 
-    :param task_ids: List of task IDs to filter
+    :param task_ids: List of task IDs to filter. An empty list selects no
+        row, and a task ID with neither a PID nor a comm selects all of them.
     :type task_ids: list(lisa.trace.TaskID)
 
     :param df: Dataframe to act on.
@@ -949,22 +1163,81 @@ def df_filter_task_ids(df, task_ids, pid_col='pid', comm_col='comm', invert=Fals
     :type invert: bool
     """
 
-    def make_filter(task_id):
-        if pid_col and task_id.pid is not None:
-            pid = (df[pid_col] == task_id.pid)
+    # Sort the tasks depending on the fields they need to match
+    pid_tasks = []
+    comm_tasks = []
+    pid_comm_tasks = []
+    match_all = False
+    for task_id in task_ids:
+        pid = task_id.pid if pid_col else None
+        comm = task_id.comm[:comm_max_len] if comm_col and task_id.comm is not None else None
+
+        if pid is None and comm is None:
+            match_all = True
+        elif comm is None:
+            pid_tasks.append(pid)
+        elif pid is None:
+            comm_tasks.append(comm)
         else:
-            pid = True
-        if comm_col and task_id.comm is not None:
-            comm = (df[comm_col] == task_id.comm[:comm_max_len])
+            pid_comm_tasks.append((pid, comm))
+
+    def encode_pids(task_pids):
+        pids = df[pid_col]
+        # Integer PIDs can directly be used as codes
+        if isinstance(pids.dtype, np.dtype) and pids.dtype.kind in 'iu':
+            return (
+                pids.to_numpy(),
+                np.array(task_pids, dtype=np.int64),
+            )
         else:
-            comm = True
+            return _data_encode(pids, task_pids)
 
-        return pid & comm
+    # Rather than building and ORing one mask per task, all the tasks are
+    # looked up at once, which scales better with the number of tasks.
+    if match_all:
+        tasks_filter = np.ones(len(df), dtype=bool)
+    else:
+        tasks_filter = np.zeros(len(df), dtype=bool)
 
-    tasks_filters = map(make_filter, task_ids)
+        if pid_tasks or pid_comm_tasks:
+            pids, task_pids = encode_pids(
+                pid_tasks + [pid for pid, comm in pid_comm_tasks]
+            )
+        if comm_tasks or pid_comm_tasks:
+            comms, task_comms = _data_encode(
+                df[comm_col],
+                comm_tasks + [comm for pid, comm in pid_comm_tasks]
+            )
+
+        if pid_tasks:
+            tasks_filter |= np.isin(pids, task_pids[:len(pid_tasks)])
 
-    # Combine all the task filters with OR
-    tasks_filter = functools.reduce(operator.or_, tasks_filters, False)
+        if comm_tasks:
+            tasks_filter |= np.isin(comms, task_comms[:len(comm_tasks)])
+
+        if pid_comm_tasks:
+            task_pids = task_pids[len(pid_tasks):]
+            task_comms = task_comms[len(comm_tasks):]
+
+            # With only a few tasks, comparing each column directly is cheaper
+            # than building the keys below
+            if len(pid_comm_tasks) <= 16:
+                for task_pid, task_comm in zip(task_pids, task_comms):
+                    tasks_filter |= (pids == task_pid) & (comms == task_comm)
+            else:
+                # Categorical codes can be small integers
+                pids = pids.astype(np.int64, copy=False)
+                comms = comms.astype(np.int64, copy=False)
+                task_pids = task_pids.astype(np.int64, copy=False)
+                task_comms = task_comms.astype(np.int64, copy=False)
+
+                # Encode each (pid, comm) pair into a single integer key. Comm
+                # codes are shifted to be positive and smaller than the radix,
+                # which makes the encoding injective.
+                radix = int(max(comms.max(initial=-1), task_comms.max())) + 3
+                keys = pids * radix + (comms + 2)
+                task_keys = task_pids * radix + (task_comms + 2)
+                tasks_filter |= np.isin(keys, task_keys)
 
     if invert:
         tasks_filter = ~tasks_filter
@@ -972,6 +1245,30 @@ def df_filter_task_ids(df, task_ids, pid_col='pid', comm_col='comm', invert=Fals
     return df[tasks_filter]
 
 
+def _data_encode(series, values):
+    """
+    Encode the values of a series and a list of other values as integer
+    codes, such that comparing codes is equivalent to comparing values.
+
+    :returns: A tuple ``(codes, values_codes)`` of :class:`numpy.ndarray`.
+        Missing values in ``series`` are encoded as ``-1``, and items of
+        ``values`` not appearing in ``series`` are encoded as ``-2``.
+
+    .. note:: If ``series`` is categorical, its codes are reused. Otherwise,
+        it will be factorized.
+    """
+    if series.dtype.name == 'category':
+        codes = series.cat.codes.to_numpy()
+        categories = series.cat.categories
+    else:
+        codes, categories = pd.factorize(series)
+        categories = pd.Index(categories)
+
+    values_codes = categories.get_indexer(values)
+    values_codes[values_codes == -1] = -2
+    return (codes, values_codes)
+
+
 @SeriesAccessor.register_accessor
 def series_local_extremum(series, kind):
     """
@@ -990,8 +1287,16 @@ def series_local_extremum(series, kind):
     else:
         raise ValueError('Unsupported kind: {}'.format(kind))
 
-    ilocs = scipy.signal.argrelextrema(series.to_numpy(), comparator=comparator)
-    return series.iloc[ilocs]
+    # Compare each value with its neighbors using views on the same array.
+    # This gives the same result as scipy.signal.argrelextrema() without
+    # building shifted copies of the data: the first and last values are
+    # only compared with their only neighbor.
+    values = series.to_numpy()
+    mask = np.ones(len(values), dtype=bool)
+    mask[1:] &= comparator(values[1:], values[:-1])
+    mask[:-1] &= comparator(values[:-1], values[1:])
+
+    return series.iloc[np.flatnonzero(mask)]
 
 
 @SeriesAccessor.register_accessor
@@ -1018,7 +1323,7 @@ def series_tunnel_mean(*args, **kwargs):
 
 
 @SeriesAccessor.register_accessor
-def series_rolling_apply(series, func, window, window_float_index=True, center=False):
+def series_rolling_apply(series, func, window, window_float_index=True, center=False, raw=False):
     """
     Apply a function on a rolling window of a series.
 
@@ -1043,11 +1348,18 @@ def series_rolling_apply(series, func, window, window_float_index=True, center=F
         recommended if the index is not used by ``func`` since it will remove
         the need for a conversion.
     :type window_float_index: bool
+
+    :param raw: If ``True``, ``func`` will be passed a :class:`numpy.ndarray`
+        with the values of the window rather than a :class:`pandas.Series`.
+        This is much faster as it avoids creating a series for each window,
+        and should be used if ``func`` only needs the values.
+        ``window_float_index`` is ignored in that case.
+    :type raw: bool
     """
     orig_index = series.index
 
     # Wrap the func to turn the index into nanosecond Float64Index
-    if window_float_index:
+    if window_float_index and not raw:
         def func(s, func=func):
             s.index = s.index.astype('int64') * 1e-9
             return func(s)
@@ -1058,7 +1370,7 @@ def series_rolling_apply(series, func, window, window_float_index=True, center=F
 
     window_ns = int(window * 1e9)
     rolling_window = '{}ns'.format(window_ns)
-    values = series.rolling(rolling_window).apply(func, raw=False).values
+    values = series.rolling(rolling_window).apply(func, raw=raw).values
 
     if center:
         new_index = orig_index - (window / 2)
@@ -1069,6 +1381,13 @@ def series_rolling_apply(series, func, window, window_float_index=True, center=F
 
 
 def _data_find_unique_bool_vector(data, cols, all_col, keep):
+    return pd.Series(
+        _data_find_unique_bool_array(data, cols, all_col, keep),
+        index=data.index,
+    )
+
+
+def _data_find_unique_bool_array(data, cols, all_col, keep):
     if keep == 'first':
         shift = 1
     elif keep == 'last':
@@ -1078,34 +1397,59 @@ def _data_find_unique_bool_vector(data, cols, all_col, keep):
     else:
         raise ValueError('Unknown keep value: {}'.format(keep))
 
-    dedup_data = data[cols] if cols else data
-    # Unique values will be True, duplicate False
-    cond = dedup_data != dedup_data.shift(shift)
+    def find_unique(values):
+        # Unique values will be True, duplicate False. The first (or last)
+        # value has nothing to be compared with, so it is unique.
+        cond = np.ones(len(values), dtype=bool)
+        if shift > 0:
+            values, other = values[1:], values[:-1]
+            out = cond[1:]
+        else:
+            values, other = values[:-1], values[1:]
+            out = cond[:-1]
+
+        # Missing values are treated as being different from anything, like
+        # when comparing pandas.Series
+        equal = _to_bool_array(values == other)
+        if values.dtype == object:
+            equal &= pd.notna(values)
+
+        np.logical_not(equal, out=out)
+        return cond
+
     if isinstance(data, pd.DataFrame):
+        dedup_data = data[cols] if cols else data
+        conds = [
+            find_unique(col.values)
+            for col_name, col in dedup_data.items()
+        ]
+
         # (not (duplicate and duplicate))
         # (not ((not unique) and (not unique)))
         # (not (not (unique or unique)))
         # (unique or unique)
         if all_col:
-            cond = cond.any(axis=1)
+            cond = np.logical_or.reduce(conds)
         # (not (duplicate or duplicate))
         # (not (duplicate or duplicate))
         # (not ((not unique) or (not unique)))
         # (not (not (unique and unique)))
         # (unique and unique)
         else:
-            cond = cond.all(axis=1)
+            cond = np.logical_and.reduce(conds)
+    else:
+        cond = find_unique(data.values)
 
     # Also mark as duplicate the first row in a run
     if keep is None:
-        cond &= cond.shift(-1).fillna(True)
+        cond[:-1] = cond[:-1] & cond[1:]
 
     return cond
 
 
 def _data_deduplicate(data, keep, consecutives, cols, all_col):
     if consecutives:
-        return data.loc[_data_find_unique_bool_vector(data, cols, all_col, keep)]
+        return data.iloc[_data_find_unique_bool_array(data, cols, all_col, keep)]
     else:
         if not all_col:
             raise ValueError("all_col=False is not supported with consecutives=False")
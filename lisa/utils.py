@@ -401,6 +401,37 @@ class Serializable(Loggable):
 
         return yaml
 
+    # Building a YAML instance is expensive, so keep the ones not in use for
+    # later. YAML instances are not thread-safe, so the pool is thread-local.
+    _yaml_pool = threading.local()
+
+    @classmethod
+    @contextlib.contextmanager
+    def _borrow_yaml(cls, typ):
+        """
+        Context manager providing a YAML instance as created by
+        :meth:`_get_yaml`, taken from a per-thread pool.
+
+        The instance is removed from the pool while in use, so nested uses
+        (e.g. ``!include``) get a separate instance.
+        """
+        try:
+            pool = Serializable._yaml_pool.val
+        except AttributeError:
+            pool = {}
+            Serializable._yaml_pool.val = pool
+
+        instances = pool.setdefault((cls, typ), [])
+        try:
+            yaml = instances.pop()
+        except IndexError:
+            yaml = cls._get_yaml(typ)
+
+        yield yaml
+        # Only give back the instance if it was used successfully, so that we
+        # don't reuse any state left behind by an exception
+        instances.append(yaml)
+
     @classmethod
     def _yaml_unknown_tag_constructor(cls, loader, node):
         # Get the basic data types that can be expressed using the YAML syntax,
@@ -457,12 +488,11 @@ class Serializable(Loggable):
         if not os.path.isabs(path):
             path = os.path.join(Serializable._included_path.val, path)
 
-        # Since the parser is not re-entrant, create a fresh one
-        yaml = cls._get_yaml(typ)
-
-        with cls._set_relative_include_root(path):
-            with open(path, 'r', encoding=cls.YAML_ENCODING) as f:
-                return yaml.load(f)
+        # Since the parser is not re-entrant, use another instance
+        with cls._borrow_yaml(typ) as yaml:
+            with cls._set_relative_include_root(path):
+                with open(path, 'r', encoding=cls.YAML_ENCODING) as f:
+                    return yaml.load(f)
 
     @classmethod
     def _yaml_env_var_constructor(cls, loader, suffix, node):
@@ -517,32 +547,36 @@ class Serializable(Loggable):
         if fmt is None:
             fmt = cls.DEFAULT_SERIALIZATION_FMT
 
-        yaml_kwargs = dict(mode='w', encoding=cls.YAML_ENCODING)
-        if fmt == 'yaml':
-            kwargs = yaml_kwargs
-            dumper = cls._get_yaml('unsafe').dump
-        elif fmt == 'yaml-roundtrip':
-            kwargs = yaml_kwargs
-            dumper = cls._get_yaml('rt').dump
+        if fmt in ('yaml', 'yaml-roundtrip'):
+            typ = 'unsafe' if fmt == 'yaml' else 'rt'
+
+            def dumper(data, f):
+                with cls._borrow_yaml(typ) as yaml:
+                    yaml.dump(data, f)
+
+            def dumps(data):
+                return cls._to_yaml(data, typ=typ).encode(cls.YAML_ENCODING)
+
         elif fmt == 'pickle':
-            kwargs = dict(mode='wb')
             dumper = pickle.dump
+            dumps = pickle.dumps
         else:
             raise ValueError('Unknown format "{}"'.format(fmt))
 
         if isinstance(filepath, io.IOBase):
-            cm = nullcontext(filepath)
+            dumper(instance, filepath)
         else:
-            cm = open(str(filepath), **kwargs)
-
-        with cm as fh:
-            dumper(instance, fh)
+            # Serialize in memory and write the file in one go, rather than
+            # letting the emitter issue lots of small writes
+            content = dumps(instance)
+            with open(str(filepath), 'wb') as fh:
+                fh.write(content)
 
     @classmethod
-    def _to_yaml(cls, data):
-        yaml = cls._get_yaml('unsafe')
+    def _to_yaml(cls, data, typ='unsafe'):
         buff = io.StringIO()
-        yaml.dump(data, buff)
+        with cls._borrow_yaml(typ) as yaml:
+            yaml.dump(data, buff)
         return buff.getvalue()
 
     def to_yaml(self):
@@ -574,17 +608,28 @@ class Serializable(Loggable):
 
     @classmethod
     def _from_path(cls, filepath, fmt):
-        yaml = cls._get_yaml('unsafe')
         filepath = str(filepath)
         if fmt is None:
             fmt = cls.DEFAULT_SERIALIZATION_FMT
 
         if fmt == 'yaml':
             kwargs = dict(mode='r', encoding=cls.YAML_ENCODING)
-            loader = yaml.load
+
+            # Give the file object to the parser rather than its content, so
+            # that error messages and tag locations mention the file name.
+            # Reads are already buffered by the file object.
+            def loader(fh):
+                with cls._borrow_yaml('unsafe') as yaml:
+                    return yaml.load(fh)
+
         elif fmt == 'pickle':
             kwargs = dict(mode='rb')
-            loader = pickle.load
+
+            # Read the whole file at once rather than letting the unpickler
+            # issue lots of small reads
+            def loader(fh):
+                return pickle.loads(fh.read())
+
         else:
             raise ValueError('Unknown format "{}"'.format(fmt))
 
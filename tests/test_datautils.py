@@ -17,9 +17,11 @@
 
 from unittest import TestCase
 
+import numpy as np
 import pandas as pd
 
 import lisa.datautils as du
+from lisa.trace import TaskID
 
 class DfCheck(TestCase):
     def test_df_split_signals(self):
@@ -36,3 +38,227 @@ class DfCheck(TestCase):
                 self.assertEqual(len(subdf), 3)
             else:
                 self.assertEqual(len(subdf), 2)
+
+    def test_df_split_signals_multi_cols(self):
+        index = list(map(float, range(1, 7)))
+        cols = ["foo", "bar", "baz"]
+
+        data = [(i, i % 2, i % 3) for i in range(len(index))]
+
+        df = pd.DataFrame(index=index, data=data, columns=cols)
+
+        signals = list(du.df_split_signals(df, ["bar", "baz"]))
+        self.assertEqual(len(signals), 6)
+        # Signals are yielded in order of first appearance
+        self.assertEqual(
+            [(ident["bar"], ident["baz"]) for ident, subdf in signals],
+            [(0, 0), (1, 1), (0, 2), (1, 0), (0, 1), (1, 2)],
+        )
+        for ident, subdf in signals:
+            self.assertEqual(len(subdf), 1)
+            self.assertEqual(subdf["bar"].iloc[0], ident["bar"])
+            self.assertEqual(subdf["baz"].iloc[0], ident["baz"])
+
+    def test_series_rolling_apply_raw(self):
+        series = pd.Series(
+            [1.0, 2.0, 3.0, 4.0, 5.0],
+            index=[0.0, 0.5, 1.0, 2.0, 2.5],
+        )
+
+        ref = du.series_rolling_apply(series, lambda s: s.sum(), window=1)
+        res = du.series_rolling_apply(series, lambda a: a.sum(), window=1, raw=True)
+        self.assertEqual(list(res), list(ref))
+        self.assertEqual(list(res), [1.0, 3.0, 5.0, 4.0, 9.0])
+
+    def _make_tasks_df(self, comm_dtype=None):
+        long_comm = 'x' * du.TASK_COMM_MAX_LEN
+        df = pd.DataFrame(
+            index=list(map(float, range(8))),
+            data=dict(
+                pid=[1, 1, 2, 2, 3, 4, 1, 5],
+                comm=['a', 'b', 'a', 'b', 'a', long_comm, None, 'c'],
+            ),
+        )
+        if comm_dtype:
+            df['comm'] = df['comm'].astype(comm_dtype)
+        return df
+
+    def _filter_task_ids(self, df, task_ids, **kwargs):
+        return list(du.df_filter_task_ids(df, task_ids, **kwargs).index)
+
+    def test_df_filter_task_ids(self):
+        for comm_dtype in (None, 'category'):
+            df = self._make_tasks_df(comm_dtype)
+            with self.subTest(comm_dtype=comm_dtype):
+                # PID and comm
+                self.assertEqual(self._filter_task_ids(df, [TaskID(1, 'a')]), [0.0])
+                self.assertEqual(
+                    self._filter_task_ids(df, [TaskID(1, 'b'), TaskID(2, 'a')]),
+                    [1.0, 2.0],
+                )
+                # Unknown comm and unknown PID
+                self.assertEqual(self._filter_task_ids(df, [TaskID(1, 'c')]), [])
+                self.assertEqual(self._filter_task_ids(df, [TaskID(42, 'a')]), [])
+                # Mixing tasks with and without PID or comm
+                self.assertEqual(
+                    self._filter_task_ids(df, [TaskID(3, 'a'), TaskID(5, None), TaskID(None, 'b')]),
+                    [1.0, 3.0, 4.0, 7.0],
+                )
+
+    def test_df_filter_task_ids_wildcard(self):
+        df = self._make_tasks_df()
+        # Any comm
+        self.assertEqual(self._filter_task_ids(df, [TaskID(1, None)]), [0.0, 1.0, 6.0])
+        # Any PID
+        self.assertEqual(self._filter_task_ids(df, [TaskID(None, 'a')]), [0.0, 2.0, 4.0])
+        # Any task
+        self.assertEqual(self._filter_task_ids(df, [TaskID(None, None)]), list(df.index))
+        self.assertEqual(self._filter_task_ids(df, [TaskID(None, None)], invert=True), [])
+        # No task
+        self.assertEqual(self._filter_task_ids(df, []), [])
+        self.assertEqual(self._filter_task_ids(df, [], invert=True), list(df.index))
+        # Ignored columns
+        self.assertEqual(self._filter_task_ids(df, [TaskID(1, 'a')], comm_col=None), [0.0, 1.0, 6.0])
+        self.assertEqual(self._filter_task_ids(df, [TaskID(1, 'a')], pid_col=None), [0.0, 2.0, 4.0])
+
+    def test_df_filter_task_ids_long_comm(self):
+        for comm_dtype in (None, 'category'):
+            df = self._make_tasks_df(comm_dtype)
+            with self.subTest(comm_dtype=comm_dtype):
+                # The comm of the task is truncated to the length of the comms
+                # in the trace
+                comm = 'x' * (du.TASK_COMM_MAX_LEN + 5)
+                self.assertEqual(self._filter_task_ids(df, [TaskID(4, comm)]), [5.0])
+                self.assertEqual(self._filter_task_ids(df, [TaskID(None, comm)]), [5.0])
+                self.assertEqual(
+                    self._filter_task_ids(df, [TaskID(4, comm)], comm_max_len=3),
+                    [],
+                )
+
+    def test_df_filter_task_ids_missing_pid(self):
+        df = self._make_tasks_df()
+        df['pid'] = [1.0, np.nan, 2.0, 2.0, np.nan, 4.0, 1.0, 5.0]
+
+        self.assertEqual(self._filter_task_ids(df, [TaskID(2, None)]), [2.0, 3.0])
+        self.assertEqual(self._filter_task_ids(df, [TaskID(1, 'b')]), [])
+        self.assertEqual(
+            self._filter_task_ids(df, [TaskID(1, 'a'), TaskID(None, 'b')]),
+            [0.0, 1.0, 3.0],
+        )
+        # Rows without PID are not matched, so they are kept when inverting
+        self.assertEqual(
+            self._filter_task_ids(df, [TaskID(2, None), TaskID(1, None)], invert=True),
+            [1.0, 4.0, 5.0, 7.0],
+        )
+
+    def test_df_filter_task_ids_invert(self):
+        for comm_dtype in (None, 'category'):
+            df = self._make_tasks_df(comm_dtype)
+            with self.subTest(comm_dtype=comm_dtype):
+                task_ids = [TaskID(1, 'a'), TaskID(None, 'b'), TaskID(5, None)]
+                selected = self._filter_task_ids(df, task_ids)
+                inverted = self._filter_task_ids(df, task_ids, invert=True)
+                self.assertEqual(selected, [0.0, 1.0, 3.0, 7.0])
+                self.assertEqual(inverted, [2.0, 4.0, 5.0, 6.0])
+
+    def test_series_align_signal_tie(self):
+        ref = pd.Series(
+            [2.0, 2.0, 2.0, 1.0, 1.0, 3.0, 1.0, 1.0, 3.0, 3.0, 1.0],
+            index=list(map(float, range(11))),
+        )
+        to_align = pd.Series(
+            [3.0, 0.0, 2.0, 0.0],
+            index=[1.0, 2.0, 3.0, 4.0],
+        )
+
+        # After resampling, the correlation is [3, 6, 6, 0, 0]. The first of
+        # the tied maxima gives the shift, regardless of the rounding noise
+        # added by the computation of the correlation.
+        ref, aligned = du.series_align_signal(ref, to_align)
+        self.assertEqual(list(ref), [2.0, 2.0, 1.0])
+        self.assertEqual(list(aligned.index), [1.0, 2.5, 4.0])
+        self.assertTrue(aligned.iloc[:2].isnull().all())
+        self.assertEqual(aligned.iloc[2], 3.0)
+
+    def test_df_filter_missing(self):
+        df = pd.DataFrame(
+            index=list(map(float, range(4))),
+            data=dict(comm=['a', None, np.nan, 'b']),
+        )
+
+        for comm_dtype in (None, 'category', 'string'):
+            _df = df.astype(comm_dtype) if comm_dtype else df
+            with self.subTest(comm_dtype=comm_dtype):
+                # Missing values never match, like with pandas.Series comparison
+                self.assertEqual(list(du.df_filter(_df, {'comm': None}).index), [])
+                self.assertEqual(list(du.df_filter(_df, {'comm': 'a'}).index), [0.0])
+
+    def test_series_window_nearest(self):
+        series = pd.Series(
+            [0.0, 1.0, 2.0, 3.0, 4.0],
+            index=[0.0, 1.0, 2.0, 4.0, 8.0],
+        )
+
+        def nearest(x):
+            return series.index.get_indexer([x], method='nearest')[0]
+
+        cases = {
+            # Exact matches
+            0.0: 0,
+            2.0: 2,
+            8.0: 4,
+            # Closer to one side
+            2.5: 2,
+            5.0: 3,
+            # Ties between the previous and next values select the next one
+            0.5: 1,
+            3.0: 3,
+            6.0: 4,
+            # Outside of the index
+            -1.0: 0,
+            10.0: 4,
+        }
+
+        for x, loc in cases.items():
+            with self.subTest(x=x):
+                self.assertEqual(nearest(x), loc)
+                res = du.series_window(series, (x, x), method='nearest', clip_window=False)
+                self.assertEqual(list(res.index), [series.index[loc]])
+
+        res = du.series_window(series, (0.5, 6.0), method='nearest', clip_window=False)
+        self.assertEqual(list(res), [1.0, 2.0, 3.0, 4.0])
+        res = du.series_window(series, (-1.0, 5.0), method='nearest', clip_window=False)
+        self.assertEqual(list(res), [0.0, 1.0, 2.0, 3.0])
+
+    def _check_compress_init(self, start):
+        df = pd.DataFrame(
+            index=[0.5, 0.6, 0.7, 1.2, start, start + 1],
+            data=dict(cpu=[0, 1, 2, 0, 1, 2]),
+        )
+        signals = [du.SignalDesc('event', ['cpu'])]
+
+        res = du.df_window_signals(df, (1.5, start + 2), signals, compress_init=True)
+
+        # The last value before the window of each CPU, followed by the rows
+        # inside the window
+        self.assertEqual(list(res['cpu']), [1, 2, 0, 1, 2])
+        self.assertEqual(list(res.index[3:]), [start, start + 1])
+
+        # The init values are squeezed on consecutive floats right before the
+        # first row in the window
+        init_index = list(res.index[:3])
+        self.assertTrue(all(x < y for x, y in zip(init_index, init_index[1:])))
+        self.assertEqual(
+            [np.nextafter(x, np.inf) for x in init_index],
+            init_index[1:] + [start],
+        )
+
+    def test_df_window_signals_compress_init(self):
+        self._check_compress_init(5.3)
+
+    def test_df_window_signals_compress_init_power_of_2(self):
+        # The init index does not cross a power of 2
+        self._check_compress_init(2.0)
+        # The init index crosses a power of 2, where the spacing of floats
+        # changes
+        self._check_compress_init(np.nextafter(2.0, np.inf))